@@ -215,6 +215,12 @@ class Client(Methods):
 
     MAX_CONCURRENT_TRANSMISSIONS = 1
 
+    # Amount of file parts uploaded in parallel for a single file
+    UPLOAD_WORKERS = 4
+
+    # Seconds an upload session is kept open after its last upload
+    UPLOAD_SESSION_IDLE_TIMEOUT = 30
+
     mimetypes = MimeTypes()
     mimetypes.readfp(StringIO(mime_types))
 
@@ -312,6 +318,13 @@ class Client(Methods):
         self.media_sessions = {}
         self.media_sessions_lock = asyncio.Lock()
 
+        self.upload_sessions = {}
+        self.upload_sessions_idle_tasks = {}
+        self.upload_slots = asyncio.Queue()
+
+        for slot in range(self.max_concurrent_transmissions):
+            self.upload_slots.put_nowait(slot)
+
         self.save_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
         self.get_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
 
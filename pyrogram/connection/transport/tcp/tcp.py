@@ -74,6 +74,9 @@ class TCP:
 
             self.socket.setblocking(False)
 
+        # MTProto requests are small and latency bound, don't let Nagle's algorithm delay them
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     async def connect(self, address: tuple):
         if self.proxy:
             with ThreadPoolExecutor(1) as executor:
@@ -94,31 +97,40 @@ class TCP:
         except Exception as e:
             log.info("Close exception: %s %s", type(e).__name__, e)
 
-    async def send(self, data: bytes):
+    async def send(self, data: bytes, *buffers: bytes):
         async with self.lock:
             try:
                 if self.writer is not None:
-                    self.writer.write(data)
+                    if buffers:
+                        # Let the transport gather the framing and the payload itself
+                        # instead of concatenating them into a new bytes object first
+                        self.writer.writelines((data,) + buffers)
+                    else:
+                        self.writer.write(data)
+
                     await self.writer.drain()
             except Exception as e:
                 log.info("Send exception: %s %s", type(e).__name__, e)
                 raise OSError(e)
 
     async def recv(self, length: int = 0):
-        data = b""
+        chunks = []
+        received = 0
 
-        while len(data) < length:
+        while received < length:
             try:
                 chunk = await asyncio.wait_for(
-                    self.reader.read(length - len(data)),
+                    self.reader.read(length - received),
                     TCP.TIMEOUT
                 )
             except (OSError, asyncio.TimeoutError):
                 return None
             else:
                 if chunk:
-                    data += chunk
+                    chunks.append(chunk)
+                    received += len(chunk)
                 else:
                     return None
 
-        return data
+        # A single chunk is returned as is, larger packets are joined only once
+        return b"".join(chunks)
@@ -38,11 +38,11 @@ class TCPFull(TCP):
         self.seq_no = 0
 
     async def send(self, data: bytes, *args):
-        data = pack("<II", len(data) + 12, self.seq_no) + data
-        data += pack("<I", crc32(data))
+        header = pack("<II", len(data) + 12, self.seq_no)
+        checksum = pack("<I", crc32(data, crc32(header)))
         self.seq_no += 1
 
-        await super().send(data)
+        await super().send(header, data, checksum)
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(4)
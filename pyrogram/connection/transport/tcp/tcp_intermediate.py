@@ -35,7 +35,7 @@ class TCPIntermediate(TCP):
         await super().send(b"\xee" * 4)
 
     async def send(self, data: bytes, *args):
-        await super().send(pack("<i", len(data)) + data)
+        await super().send(pack("<i", len(data)), data)
 
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(4)
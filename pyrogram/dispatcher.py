@@ -187,7 +187,7 @@ class Dispatcher:
 
         async def story_parser(update, users, chats):
             return (
-                await pyrogram.types.Story._parse(self.client, update.story, update.peer),
+                await pyrogram.types.Story._parse(self.client, update.story, update.peer, users, chats),
                 StoryHandler
             )
 
@@ -26,17 +26,72 @@ import math
 import os
 from hashlib import md5
 from pathlib import PurePath
-from typing import Union, BinaryIO, Callable
+from typing import Union, BinaryIO, Callable, Tuple
 
 import pyrogram
 from pyrogram import StopTransmission
 from pyrogram import raw
+from pyrogram.errors import RPCError
 from pyrogram.session import Session
 
 log = logging.getLogger(__name__)
 
 
 class SaveFile:
+    async def _get_upload_session(self: "pyrogram.Client") -> Tuple[int, Session]:
+        # Uploads go to the home DC through media sessions that are kept open between files,
+        # instead of connecting a new one for every file. There's one session per upload slot,
+        # so up to max_concurrent_transmissions uploads still run over separate connections.
+        # An open session keeps an extra connection to the home DC and pings it, so it's closed
+        # after UPLOAD_SESSION_IDLE_TIMEOUT seconds without uploads, or by terminate().
+        # The slot must be given back with _release_upload_session().
+        slot = await self.upload_slots.get()
+
+        idle_task = self.upload_sessions_idle_tasks.pop(slot, None)
+
+        if idle_task is not None:
+            idle_task.cancel()
+
+        try:
+            session = self.upload_sessions.get(slot)
+
+            if session is None:
+                session = Session(
+                    self, await self.storage.dc_id(), await self.storage.auth_key(),
+                    await self.storage.test_mode(), is_media=True
+                )
+
+                await session.start()
+
+                self.upload_sessions[slot] = session
+        except BaseException:
+            self.upload_slots.put_nowait(slot)
+            raise
+
+        return slot, session
+
+    async def _release_upload_session(self: "pyrogram.Client", slot: int, broken: bool = False):
+        # A broken session is dropped, the next upload on this slot starts a new one
+        if broken:
+            session = self.upload_sessions.pop(slot, None)
+
+            if session is not None:
+                await session.stop()
+        elif slot in self.upload_sessions:
+            self.upload_sessions_idle_tasks[slot] = self.loop.create_task(self._stop_idle_upload_session(slot))
+
+        self.upload_slots.put_nowait(slot)
+
+    async def _stop_idle_upload_session(self: "pyrogram.Client", slot: int):
+        await asyncio.sleep(self.UPLOAD_SESSION_IDLE_TIMEOUT)
+
+        # Drop the session before stopping it, an upload starting meanwhile connects a new one
+        self.upload_sessions_idle_tasks.pop(slot, None)
+        session = self.upload_sessions.pop(slot, None)
+
+        if session is not None:
+            await session.stop()
+
     async def save_file(
         self: "pyrogram.Client",
         path: Union[str, BinaryIO],
@@ -100,17 +155,34 @@ class SaveFile:
                 return None
 
             async def worker(session):
+                nonlocal is_session_broken
+
+                error = None
+
                 while True:
                     data = await queue.get()
 
                     if data is None:
-                        return
+                        break
+
+                    # Once a part was refused the file can't be completed, keep draining the queue only
+                    if error is not None:
+                        continue
 
                     try:
                         await session.invoke(data)
+                    except RPCError as e:
+                        error = e
+                        is_failed.set()
                     except Exception as e:
+                        # The connection itself failed. The part is left out: the send methods re-upload
+                        # it when Telegram reports it with FilePartMissing.
+                        is_session_broken = True
                         log.exception(e)
 
+                if error is not None:
+                    raise error
+
             part_size = 512 * 1024
 
             if isinstance(path, (str, PurePath)):
@@ -136,24 +208,29 @@ class SaveFile:
 
             file_total_parts = int(math.ceil(file_size / part_size))
             is_big = file_size > 10 * 1024 * 1024
-            workers_count = 4 if is_big else 1
+            # Parts may be uploaded in any order, so small files are sent in parallel too
+            workers_count = min(self.UPLOAD_WORKERS, file_total_parts)
             is_missing_part = file_id is not None
             file_id = file_id or self.rnd_id()
             md5_sum = md5() if not is_big and not is_missing_part else None
-            session = Session(
-                self, await self.storage.dc_id(), await self.storage.auth_key(),
-                await self.storage.test_mode(), is_media=True
-            )
-            workers = [self.loop.create_task(worker(session)) for _ in range(workers_count)]
+            slot = None
+            is_session_broken = False
+            is_failed = asyncio.Event()
+            errors = []
+            input_file = None
+            workers = []
             queue = asyncio.Queue(1)
 
             try:
-                await session.start()
+                slot, session = await self._get_upload_session()
+                workers = [self.loop.create_task(worker(session)) for _ in range(workers_count)]
 
                 fp.seek(part_size * file_part)
 
-                while True:
-                    chunk = fp.read(part_size)
+                while not is_failed.is_set():
+                    # Read on the loop's default executor to keep disk I/O off the event loop.
+                    # Not on self.executor: sync handlers block its threads while waiting for this upload.
+                    chunk = await self.loop.run_in_executor(None, fp.read, part_size)
 
                     if not chunk:
                         if not is_big and not is_missing_part:
@@ -177,7 +254,7 @@ class SaveFile:
                     await queue.put(rpc)
 
                     if is_missing_part:
-                        return
+                        break
 
                     if not is_big and not is_missing_part:
                         md5_sum.update(chunk)
@@ -201,27 +278,36 @@ class SaveFile:
             except Exception as e:
                 log.exception(e)
             else:
-                if is_big:
-                    return raw.types.InputFileBig(
-                        id=file_id,
-                        parts=file_total_parts,
-                        name=file_name,
-
-                    )
-                else:
-                    return raw.types.InputFile(
-                        id=file_id,
-                        parts=file_total_parts,
-                        name=file_name,
-                        md5_checksum=md5_sum
-                    )
+                if not is_missing_part:
+                    if is_big:
+                        input_file = raw.types.InputFileBig(
+                            id=file_id,
+                            parts=file_total_parts,
+                            name=file_name,
+
+                        )
+                    else:
+                        input_file = raw.types.InputFile(
+                            id=file_id,
+                            parts=file_total_parts,
+                            name=file_name,
+                            md5_checksum=md5_sum
+                        )
             finally:
                 for _ in workers:
                     await queue.put(None)
 
-                await asyncio.gather(*workers)
+                results = await asyncio.gather(*workers, return_exceptions=True)
+                errors = [r for r in results if isinstance(r, BaseException)]
 
-                await session.stop()
+                if slot is not None:
+                    await self._release_upload_session(slot, is_session_broken)
 
                 if isinstance(path, (str, PurePath)):
                     fp.close()
+
+            # Telegram refused a part, the file can't be sent
+            if errors:
+                raise errors[0]
+
+            return input_file
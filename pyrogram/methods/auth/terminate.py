@@ -52,6 +52,16 @@ class Terminate:
 
         self.media_sessions.clear()
 
+        for idle_task in self.upload_sessions_idle_tasks.values():
+            idle_task.cancel()
+
+        self.upload_sessions_idle_tasks.clear()
+
+        for upload_session in self.upload_sessions.values():
+            await upload_session.stop()
+
+        self.upload_sessions.clear()
+
         self.updates_watchdog_event.set()
 
         if self.updates_watchdog_task is not None:
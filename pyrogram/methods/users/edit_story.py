@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from typing import List
@@ -120,10 +121,10 @@ class EditStory:
             peer = await self.resolve_peer("me")
 
         media = None
-        privacy_rules = None
+        privacy_rules = []
 
         if privacy:
-            privacy_rules = [types.StoriesPrivacyRules(type=privacy)]
+            privacy_rules.append(types.StoriesPrivacyRules(type=privacy))
 
         if animation:
             if isinstance(animation, str):
@@ -231,24 +232,32 @@ class EditStory:
             privacy_rules.append(raw.types.InputPrivacyValueDisallowChatParticipants(chats=chats))
         '''
         if allowed_users and len(allowed_users) > 0:
-            users = [await self.resolve_peer(user_id) for user_id in allowed_users]
-            privacy_rules.append(raw.types.InputPrivacyValueAllowUsers(users=users))
+            users = await asyncio.gather(*[self.resolve_peer(user_id) for user_id in allowed_users])
+            privacy_rules.append(raw.types.InputPrivacyValueAllowUsers(users=list(users)))
         if denied_users and len(denied_users) > 0:
-            users = [await self.resolve_peer(user_id) for user_id in denied_users]
-            privacy_rules.append(raw.types.InputPrivacyValueDisallowUsers(users=users))
+            users = await asyncio.gather(*[self.resolve_peer(user_id) for user_id in denied_users])
+            privacy_rules.append(raw.types.InputPrivacyValueDisallowUsers(users=list(users)))
 
+        # Media, caption, privacy and media areas all go out in the same stories.EditStory request.
+        # Unset fields must stay None: the generated serializer sets the flags on truthiness only.
         r = await self.invoke(
             raw.functions.stories.EditStory(
                 id=story_id,
                 peer=peer,
                 media=media,
-                privacy_rules=privacy_rules,
+                privacy_rules=privacy_rules or None,
                 caption=text,
                 entities=entities,
                 media_areas=[
                     await media_area.write(self)
                     for media_area in media_areas
-                ]
+                ] if media_areas else None
             )
         )
-        return await types.Story._parse(self, r.updates[0].story, r.updates[0].peer)
+        return await types.Story._parse(
+            self,
+            r.updates[0].story,
+            r.updates[0].peer,
+            {i.id: i for i in r.users},
+            {i.id: i for i in r.chats}
+        )
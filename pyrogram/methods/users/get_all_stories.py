@@ -51,6 +51,9 @@ class GetAllStories:
 
         r = await self.invoke(rpc, sleep_threshold=-1)
 
+        users = {i.id: i for i in r.users}
+        chats = {i.id: i for i in r.chats}
+
         for peer_story in r.peer_stories:
             for story in peer_story.stories:
-                yield await types.Story._parse(self, story, peer_story.peer)
+                yield await types.Story._parse(self, story, peer_story.peer, users, chats)
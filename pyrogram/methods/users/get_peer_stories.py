@@ -62,5 +62,8 @@ class GetPeerStories:
 
         r = await self.invoke(rpc, sleep_threshold=-1)
 
+        users = {i.id: i for i in r.users}
+        chats = {i.id: i for i in r.chats}
+
         for story in r.stories.stories:
-            yield await types.Story._parse(self, story, peer)
+            yield await types.Story._parse(self, story, peer, users, chats)
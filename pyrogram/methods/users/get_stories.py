@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 from typing import Union, List, Iterable
 
@@ -72,6 +73,13 @@ class GetStories:
 
         r = await self.invoke(rpc, sleep_threshold=-1)
 
+        users = {i.id: i for i in r.users}
+        chats = {i.id: i for i in r.chats}
+
         if is_iterable:
-            return types.List([await types.Story._parse(self, story, peer) for story in r.stories])
-        return await types.Story._parse(self, r.stories[0], peer)
+            return types.List(
+                await asyncio.gather(
+                    *[types.Story._parse(self, story, peer, users, chats) for story in r.stories]
+                )
+            )
+        return await types.Story._parse(self, r.stories[0], peer, users, chats)
@@ -71,5 +71,8 @@ class GetUserStoriesHistory:
 
         r = await self.invoke(rpc, sleep_threshold=-1)
 
+        users = {i.id: i for i in r.users}
+        chats = {i.id: i for i in r.chats}
+
         for story in r.stories:
-            yield await types.Story._parse(self, story, peer)
+            yield await types.Story._parse(self, story, peer, users, chats)
@@ -255,4 +255,10 @@ class SendStory:
                 ] if media_areas is not None else None
             )
         )
-        return await types.Story._parse(self, r.updates[0].story, r.updates[0].peer)
+        return await types.Story._parse(
+            self,
+            r.updates[0].story,
+            r.updates[0].peer,
+            {i.id: i for i in r.users},
+            {i.id: i for i in r.chats}
+        )
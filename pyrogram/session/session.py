@@ -253,7 +253,9 @@ class Session:
             elif isinstance(msg.body, raw.types.Pong):
                 msg_id = msg.body.msg_id
             else:
-                if self.client is not None:
+                # Updates are handled from the main session only. Media sessions to the home DC
+                # (e.g. the ones used for uploads) would receive and dispatch them a second time.
+                if self.client is not None and not self.is_media:
                     self.loop.create_task(self.client.handle_updates(msg.body))
 
             if msg_id in self.results:
@@ -16,6 +16,10 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
 
+from __future__ import annotations
+
+import asyncio
+import functools
 import pyrogram
 
 from datetime import datetime
@@ -24,6 +28,62 @@ from typing import BinaryIO, Callable, List, Optional, Union
 from ..object import Object
 from ..update import Update
 
+
+def _parse_photo_media(client: "pyrogram.Client", media: "raw.types.MessageMediaPhoto"):
+    return (
+        enums.MessageMediaType.PHOTO,
+        types.Photo._parse(client, media.photo, media.ttl_seconds),
+        None,
+        None
+    )
+
+
+def _parse_document_media(client: "pyrogram.Client", media: "raw.types.MessageMediaDocument"):
+    doc = media.document
+
+    if type(doc) is not raw.types.Document:
+        return None, None, None, None
+
+    video_attributes = None
+    is_animated = False
+
+    for attribute in doc.attributes:
+        attribute_type = type(attribute)
+
+        if attribute_type is raw.types.DocumentAttributeVideo:
+            video_attributes = attribute
+        elif attribute_type is raw.types.DocumentAttributeAnimated:
+            is_animated = True
+
+    if is_animated:
+        animation = types.Animation._parse(client, doc, video_attributes, None)
+        return enums.MessageMediaType.ANIMATION, None, animation, None
+
+    if video_attributes is not None:
+        video = types.Video._parse(client, doc, video_attributes, None, media.ttl_seconds)
+        return enums.MessageMediaType.VIDEO, None, None, video
+
+    return None, None, None, None
+
+
+# Story media parsers keyed by the exact raw media type.
+# Each parser returns a (media_type, photo, animation, video) tuple.
+_MEDIA_PARSERS = {
+    raw.types.MessageMediaPhoto: _parse_photo_media,
+    raw.types.MessageMediaDocument: _parse_document_media
+}
+
+_CHANNEL_PEERS = (raw.types.PeerChannel, raw.types.InputPeerChannel)
+
+_PRIVACY_VALUES = {
+    raw.types.PrivacyValueAllowAll: enums.StoryPrivacy.PUBLIC,
+    raw.types.PrivacyValueAllowCloseFriends: enums.StoryPrivacy.CLOSE_FRIENDS,
+    raw.types.PrivacyValueAllowContacts: enums.StoryPrivacy.CONTACTS,
+    raw.types.PrivacyValueDisallowAll: enums.StoryPrivacy.PRIVATE,
+    raw.types.PrivacyValueDisallowContacts: enums.StoryPrivacy.NO_CONTACTS
+}
+
+
 class Story(Object, Update):
     """A story.
 
@@ -176,85 +236,148 @@ class Story(Object, Update):
         #self.allowed_chats = allowed_chats
         #self.denied_chats = denied_chats
 
+        self._exported_link = None
+
+    @functools.cached_property
+    def _reply_chat_id(self) -> Optional[int]:
+        # Chat the story was posted by, used as the target of the bound methods
+        if self.from_user is not None:
+            return self.from_user.id
+
+        if self.sender_chat is not None:
+            return self.sender_chat.id
+
+        return None
+
+    @functools.cached_property
+    def _edit_chat_id(self) -> Optional[int]:
+        # Channel the story belongs to, None for stories of the current user
+        if self.sender_chat is not None:
+            return self.sender_chat.id
+
+        return None
+
     @staticmethod
-    async def _parse(
+    async def _parse_peer(
         client: "pyrogram.Client",
-        stories: raw.base.StoryItem,
-        peer: Union["raw.types.PeerChannel", "raw.types.PeerUser"]
-    ) -> "Story":
-        if isinstance(stories, raw.types.StoryItemSkipped):
-            return await types.StorySkipped._parse(client, stories, peer)
-        if isinstance(stories, raw.types.StoryItemDeleted):
-            return await types.StoryDeleted._parse(client, stories, peer)
-        entities = [types.MessageEntity._parse(client, entity, {}) for entity in stories.entities]
-        entities = types.List(filter(lambda x: x is not None, entities))
-        animation = None
-        photo = None
-        video = None
+        stories: "raw.types.StoryItem",
+        peer: Union["raw.types.PeerChannel", "raw.types.PeerUser"],
+        users: dict,
+        chats: dict
+    ):
         chat = None
         from_user = None
         sender_chat = None
-        privacy = None
-        forward_from = None
-        #allowed_chats = None
-        allowed_users = None
-        #denied_chats = None
-        denied_users = None
-        if stories.media:
-            if isinstance(stories.media, raw.types.MessageMediaPhoto):
-                photo = types.Photo._parse(client, stories.media.photo, stories.media.ttl_seconds)
-                media_type = enums.MessageMediaType.PHOTO
-            elif isinstance(stories.media, raw.types.MessageMediaDocument):
-                doc = stories.media.document
-
-                if isinstance(doc, raw.types.Document):
-                    attributes = {type(i): i for i in doc.attributes}
-
-                    if raw.types.DocumentAttributeAnimated in attributes:
-                        video_attributes = attributes.get(raw.types.DocumentAttributeVideo, None)
-                        animation = types.Animation._parse(client, doc, video_attributes, None)
-                        media_type = enums.MessageMediaType.ANIMATION
-                    elif raw.types.DocumentAttributeVideo in attributes:
-                        video_attributes = attributes.get(raw.types.DocumentAttributeVideo, None)
-                        video = types.Video._parse(client, doc, video_attributes, None, stories.media.ttl_seconds)
-                        media_type = enums.MessageMediaType.VIDEO
-                    else:
-                        media_type = None
-            else:
-                media_type = None
-        if isinstance(peer, raw.types.PeerChannel) or isinstance(peer, raw.types.InputPeerChannel):
-            chat_id = utils.get_channel_id(peer.channel_id)
-            chat = await client.invoke(
-                raw.functions.channels.GetChannels(
-                    id=[await client.resolve_peer(chat_id)]
-                )
-            )
+        peer_type = type(peer)
+
+        if peer_type in _CHANNEL_PEERS:
             if stories.from_id is not None:
                 if getattr(stories.from_id, "user_id", None) is not None:
-                    from_user = await client.get_users(stories.from_id.user_id)
-                    chat = types.Chat._parse_chat(client, chat.chats[0])
+                    from_user = await Story._get_user(client, stories.from_id.user_id, users)
+                    chat = await Story._get_chat(client, peer.channel_id, chats)
                 elif getattr(stories.from_id, "channel_id", None) is not None:
                     sender_chat = types.Chat._parse_chat(client, stories.from_id.channel_id)
                 elif getattr(stories.from_id, "chat_id", None) is not None:
                     sender_chat = types.Chat._parse_chat(client, stories.from_id.chat_id)
             else:
-                sender_chat = types.Chat._parse_chat(client, chat.chats[0])
-        elif isinstance(peer, raw.types.InputPeerSelf):
+                sender_chat = await Story._get_chat(client, peer.channel_id, chats)
+        elif peer_type is raw.types.InputPeerSelf:
             from_user = client.me
         else:
-            from_user = await client.get_users(peer.user_id)
+            from_user = await Story._get_user(client, peer.user_id, users)
+
+        return chat, from_user, sender_chat
+
+    @staticmethod
+    async def _get_user(client: "pyrogram.Client", user_id: int, users: dict) -> "types.User":
+        raw_user = users.get(user_id, None)
+
+        if raw_user is not None:
+            return types.User._parse(client, raw_user)
+
+        return await client.get_users(user_id)
+
+    @staticmethod
+    async def _get_chat(client: "pyrogram.Client", channel_id: int, chats: dict) -> "types.Chat":
+        raw_chat = chats.get(channel_id, None)
+
+        if raw_chat is None:
+            r = await client.invoke(
+                raw.functions.channels.GetChannels(
+                    id=[await client.resolve_peer(utils.get_channel_id(channel_id))]
+                )
+            )
+            raw_chat = r.chats[0]
+
+        return types.Chat._parse_chat(client, raw_chat)
+
+    @staticmethod
+    async def _parse_forward_from(
+        client: "pyrogram.Client",
+        fwd_from: Optional["raw.types.StoryFwdHeader"]
+    ) -> Optional["types.StoryForwardHeader"]:
+        if fwd_from is None:
+            return None
+
+        return await types.StoryForwardHeader._parse(client, fwd_from)
+
+    @staticmethod
+    async def _parse_media_areas(
+        client: "pyrogram.Client",
+        media_areas: Optional[List["raw.base.MediaArea"]]
+    ) -> Optional[List["types.MediaArea"]]:
+        if not media_areas:
+            return None
+
+        return list(
+            await asyncio.gather(
+                *[types.MediaArea._parse(client, media_area) for media_area in media_areas]
+            )
+        )
+
+    @staticmethod
+    async def _parse(
+        client: "pyrogram.Client",
+        stories: raw.base.StoryItem,
+        peer: Union["raw.types.PeerChannel", "raw.types.PeerUser"],
+        users: dict = None,
+        chats: dict = None
+    ) -> "Story":
+        # users and chats are the id -> raw peer maps that come along with the
+        # response. Peers found there are parsed directly instead of being fetched.
+        users = users or {}
+        chats = chats or {}
+        stories_type = type(stories)
+
+        if stories_type is raw.types.StoryItemSkipped:
+            return await types.StorySkipped._parse(client, stories, peer, users, chats)
+        if stories_type is raw.types.StoryItemDeleted:
+            return await types.StoryDeleted._parse(client, stories, peer, users, chats)
+
+        entities = None
+
+        if stories.entities:
+            entities = [types.MessageEntity._parse(client, entity, users) for entity in stories.entities]
+            entities = types.List([entity for entity in entities if entity is not None]) or None
+
+        media_type = None
+        animation = None
+        photo = None
+        video = None
+        privacy = None
+        #allowed_chats = None
+        allowed_users = None
+        #denied_chats = None
+        denied_users = None
+
+        media_parser = _MEDIA_PARSERS.get(type(stories.media))
+
+        if media_parser is not None:
+            media_type, photo, animation, video = media_parser(client, stories.media)
 
         for priv in stories.privacy:
-            if isinstance(priv, raw.types.PrivacyValueAllowAll):
-                privacy = enums.StoryPrivacy.PUBLIC
-            elif isinstance(priv, raw.types.PrivacyValueAllowCloseFriends):
-                privacy = enums.StoryPrivacy.CLOSE_FRIENDS
-            elif isinstance(priv, raw.types.PrivacyValueAllowContacts):
-                privacy = enums.StoryPrivacy.CONTACTS
-            elif isinstance(priv, raw.types.PrivacyValueDisallowAll):
-                privacy = enums.StoryPrivacy.PRIVATE
-            elif isinstance(priv, raw.types.PrivacyValueDisallowContacts):
-                privacy = enums.StoryPrivacy.NO_CONTACTS
+            priv_type = type(priv)
+            privacy = _PRIVACY_VALUES.get(priv_type, privacy)
 
             '''
             if allowed_chats and len(allowed_chats) > 0:
@@ -264,20 +387,18 @@ class Story(Object, Update):
                 chats = [int(str(chat_id)[3:]) if str(chat_id).startswith("-100") else chat_id for chat_id in denied_chats]
                 privacy_rules.append(raw.types.InputPrivacyValueDisallowChatParticipants(chats=chats))
             '''
-            if isinstance(priv, raw.types.PrivacyValueAllowUsers):
+            if priv_type is raw.types.PrivacyValueAllowUsers:
                 allowed_users = priv.users
-            if isinstance(priv, raw.types.PrivacyValueDisallowUsers):
+            if priv_type is raw.types.PrivacyValueDisallowUsers:
                 denied_users = priv.users
 
-        if stories.fwd_from is not None:
-            forward_from = await types.StoryForwardHeader._parse(client, stories.fwd_from)
-
-        media_areas = None
-        if stories.media_areas is not None and len(stories.media_areas) > 0:
-            media_areas = [
-                await types.MediaArea._parse(client, media_area)
-                for media_area in stories.media_areas
-            ]
+        # Peer resolution and the forward header may each need a round trip;
+        # run them (and the media areas) concurrently instead of one after another.
+        (chat, from_user, sender_chat), forward_from, media_areas = await asyncio.gather(
+            Story._parse_peer(client, stories, peer, users, chats),
+            Story._parse_forward_from(client, stories.fwd_from),
+            Story._parse_media_areas(client, stories.media_areas)
+        )
 
         return Story(
             id=stories.id,
@@ -298,7 +419,7 @@ class Story(Object, Update):
             contacts=stories.contacts,
             selected_contacts=stories.selected_contacts,
             caption=stories.caption,
-            caption_entities=entities or None,
+            caption_entities=entities,
             views=types.StoryViews._parse(stories.views),
             privacy=privacy,
             forward_from=forward_from,
@@ -384,7 +505,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_message(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             text=text,
             parse_mode=parse_mode,
             entities=entities,
@@ -523,7 +644,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_animation(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             animation=animation,
             caption=caption,
             parse_mode=parse_mode,
@@ -662,7 +783,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_audio(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             audio=audio,
             caption=caption,
             parse_mode=parse_mode,
@@ -747,7 +868,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_cached_media(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             file_id=file_id,
             caption=caption,
             parse_mode=parse_mode,
@@ -809,7 +930,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_media_group(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             media=media,
             disable_notification=disable_notification,
             reply_to_story_id=reply_to_story_id
@@ -921,7 +1042,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_photo(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             photo=photo,
             caption=caption,
             parse_mode=parse_mode,
@@ -1019,7 +1140,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_sticker(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             sticker=sticker,
             disable_notification=disable_notification,
             reply_to_story_id=reply_to_story_id,
@@ -1162,7 +1283,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_video(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             video=video,
             caption=caption,
             parse_mode=parse_mode,
@@ -1280,7 +1401,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_video_note(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             video_note=video_note,
             duration=duration,
             length=length,
@@ -1392,7 +1513,7 @@ class Story(Object, Update):
             reply_to_story_id = self.id
 
         return await self._client.send_voice(
-            chat_id=self.from_user.id if self.from_user else self.sender_chat.id,
+            chat_id=self._reply_chat_id,
             voice=voice,
             caption=caption,
             parse_mode=parse_mode,
@@ -1428,7 +1549,7 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.delete_stories(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_ids=self.id
         )
 
@@ -1463,7 +1584,7 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             animation=animation
         )
@@ -1485,6 +1606,9 @@ class Story(Object, Update):
     ) -> "types.Story":
         """Bound method *edit* of :obj:`~pyrogram.types.Story`.
 
+        All the given fields are changed with a single request, prefer it over chaining
+        :meth:`~pyrogram.types.Story.edit_photo`, :meth:`~pyrogram.types.Story.edit_caption` and the like.
+
         Use as a shortcut for:
 
         .. code-block:: python
@@ -1497,12 +1621,13 @@ class Story(Object, Update):
         Example:
             .. code-block:: python
 
-                await story.edit_caption("hello")
+                await story.edit(
+                    photo="/path/to/photo.png",
+                    caption="hello",
+                    privacy=enums.StoriesPrivacyRules.CONTACTS
+                )
 
         Parameters:
-            story_id (``int``):
-                Unique identifier (int) of the target story.
-
             animation (``str`` | ``BinaryIO``, *optional*):
                 New story Animation.
                 Pass a file_id as string to send a animation that exists on the Telegram servers,
@@ -1553,7 +1678,7 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             privacy=privacy,
             #allowed_chats=allowed_chats,
@@ -1604,12 +1729,24 @@ class Story(Object, Update):
 
         Returns:
             On success, the edited :obj:`~pyrogram.types.Story` is returned.
+            If the new plain caption is the same as the current one, no request is made and the story itself is returned.
 
         Raises:
             RPCError: In case of a Telegram RPC error.
         """
+        # Only a plain caption can match a story without entities. When the caption parses to plain text,
+        # skip the request if it's unchanged, otherwise hand the parsed text over so it's not parsed twice.
+        if not self.caption_entities and not caption_entities:
+            parsed = await utils.parse_text_entities(self._client, caption, parse_mode, None)
+
+            if not parsed["entities"]:
+                if parsed["message"] == self.caption:
+                    return self
+
+                caption, parse_mode = parsed["message"], enums.ParseMode.DISABLED
+
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             caption=caption,
             parse_mode=parse_mode,
@@ -1647,7 +1784,7 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             photo=photo
         )
@@ -1693,7 +1830,7 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             privacy=privacy,
             #allowed_chats=allowed_chats,
@@ -1733,12 +1870,12 @@ class Story(Object, Update):
             RPCError: In case of a Telegram RPC error.
         """
         return await self._client.edit_story(
-            chat_id=self.sender_chat.id if self.sender_chat else None,
+            chat_id=self._edit_chat_id,
             story_id=self.id,
             video=video
         )
 
-    async def export_link(self) -> "types.ExportedStoryLink":
+    async def export_link(self, refresh: bool = False) -> "types.ExportedStoryLink":
         """Bound method *export_link* of :obj:`~pyrogram.types.Story`.
 
         Use as a shortcut for:
@@ -1755,13 +1892,22 @@ class Story(Object, Update):
 
                 await story.export_link()
 
+        Parameters:
+            refresh (``bool``, *optional*):
+                Pass True to request the link again instead of returning the one exported earlier
+                for this story object.
+
         Returns:
             :obj:`~pyrogram.types.ExportedStoryLink`: a single story link is returned.
 
         Raises:
             RPCError: In case of a Telegram RPC error.
         """
-        return await self._client.export_story_link(chat_id=self.from_user.id if self.from_user else self.sender_chat.id, story_id=self.id)
+        # Story links don't change, so the first exported one is kept and reused
+        if self._exported_link is None or refresh:
+            self._exported_link = await self._client.export_story_link(chat_id=self._reply_chat_id, story_id=self.id)
+
+        return self._exported_link
 
     async def forward(
         self,
@@ -1844,7 +1990,7 @@ class Story(Object, Update):
             caption_entities=caption_entities,
             parse_mode=parse_mode,
             period=period,
-            forward_from_chat_id=self.from_user.id if self.from_user is not None else self.sender_chat.id,
+            forward_from_chat_id=self._reply_chat_id,
             forward_from_story_id=self.id
         )
 
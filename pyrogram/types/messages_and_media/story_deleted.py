@@ -54,16 +54,20 @@ class StoryDeleted(Object, Update):
     async def _parse(
         client: "pyrogram.Client",
         stories: raw.base.StoryItem,
-        peer: Union["raw.types.PeerChannel", "raw.types.PeerUser"]
+        peer: Union["raw.types.PeerChannel", "raw.types.PeerUser"],
+        users: dict = None,
+        chats: dict = None
     ) -> "StoryDeleted":
+        users = users or {}
+        chats = chats or {}
         from_user = None
         sender_chat = None
         if isinstance(peer, raw.types.PeerChannel):
-            sender_chat = await client.get_chat(peer.channel_id)
+            sender_chat = await types.Story._get_chat(client, peer.channel_id, chats)
         elif isinstance(peer, raw.types.InputPeerSelf):
             from_user = client.me
         else:
-            from_user = await client.get_users(peer.user_id)
+            from_user = await types.Story._get_user(client, peer.user_id, users)
 
         return StoryDeleted(
             id=stories.id,
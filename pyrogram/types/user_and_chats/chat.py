@@ -17,6 +17,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 from datetime import datetime
 from typing import Union, List, Optional, AsyncGenerator, BinaryIO
 
@@ -445,12 +446,14 @@ class Chat(Object):
             if getattr(full_user, "stories"):
                 peer_stories: raw.types.PeerStories = full_user.stories
                 parsed_chat.stories = types.List(
-                    [
-                        await types.Story._parse(
-                            client, story, peer_stories.peer
-                        )
-                        for story in peer_stories.stories
-                    ]
+                    await asyncio.gather(
+                        *[
+                            types.Story._parse(
+                                client, story, peer_stories.peer, users, chats
+                            )
+                            for story in peer_stories.stories
+                        ]
+                    )
                 ) or None
 
             if getattr(full_user, "wallpaper") and isinstance(full_user.wallpaper, raw.types.WallPaper):
@@ -495,12 +498,14 @@ class Chat(Object):
                 if getattr(full_chat, "stories"):
                     peer_stories: raw.types.PeerStories = full_chat.stories
                     parsed_chat.stories = types.List(
-                        [
-                            await types.Story._parse(
-                                client, story, peer_stories.peer
-                            )
-                            for story in peer_stories.stories
-                        ]
+                        await asyncio.gather(
+                            *[
+                                types.Story._parse(
+                                    client, story, peer_stories.peer, users, chats
+                                )
+                                for story in peer_stories.stories
+                            ]
+                        )
                     ) or None
 
                 if getattr(full_chat, "wallpaper") and isinstance(full_chat.wallpaper, raw.types.WallPaper):
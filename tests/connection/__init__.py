@@ -0,0 +1,50 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class Writer:
+    def __init__(self):
+        self.buffer = b""
+
+    def write(self, data: bytes):
+        self.buffer += data
+
+    def writelines(self, data):
+        for i in data:
+            self.write(i)
+
+    async def drain(self):
+        pass
+
+
+class Reader:
+    def __init__(self, *chunks: bytes):
+        self.chunks = list(chunks)
+
+    async def read(self, n: int) -> bytes:
+        if not self.chunks:
+            return b""
+
+        chunk = self.chunks.pop(0)
+
+        if len(chunk) > n:
+            chunk, rest = chunk[:n], chunk[n:]
+            self.chunks.insert(0, rest)
+
+        return chunk
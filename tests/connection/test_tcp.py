@@ -0,0 +1,107 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from binascii import crc32
+from struct import pack
+
+import pytest
+
+from pyrogram.connection.transport import TCP, TCPFull, TCPIntermediate, TCPAbridged
+from tests.connection import Reader, Writer
+
+# Payloads long enough for both the short and the long abridged length prefix
+payloads = [os.urandom(16), os.urandom(126 * 4), os.urandom(127 * 4), os.urandom(4096)]
+
+
+def transport(cls, reader: Reader = None):
+    t = cls(False, None)
+    t.socket.close()
+    t.reader, t.writer = reader, Writer()
+
+    return t
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", payloads)
+async def test_full_send(data):
+    t = transport(TCPFull)
+    t.seq_no = 0
+
+    await t.send(data)
+    await t.send(data)
+
+    expected = b""
+
+    for seq_no in range(2):
+        packet = pack("<II", len(data) + 12, seq_no) + data
+        expected += packet + pack("<I", crc32(packet))
+
+    assert t.writer.buffer == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", payloads)
+async def test_intermediate_send(data):
+    t = transport(TCPIntermediate)
+
+    await t.send(data)
+
+    assert t.writer.buffer == pack("<i", len(data)) + data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", payloads)
+async def test_abridged_send(data):
+    t = transport(TCPAbridged)
+
+    await t.send(data)
+
+    length = len(data) // 4
+
+    assert t.writer.buffer == (
+        bytes([length])
+        if length <= 126
+        else b"\x7f" + length.to_bytes(3, "little")
+    ) + data
+
+
+@pytest.mark.asyncio
+async def test_recv_chunks():
+    t = transport(TCP, Reader(b"ab", b"c", b"defg", b"h"))
+
+    assert await t.recv(8) == b"abcdefgh"
+
+
+@pytest.mark.asyncio
+async def test_recv_incomplete():
+    t = transport(TCP, Reader(b"abc"))
+
+    assert await t.recv(8) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", payloads)
+async def test_full_recv_chunks(data):
+    packet = pack("<II", len(data) + 12, 0) + data
+    packet += pack("<I", crc32(packet))
+
+    t = transport(TCPFull, Reader(packet[:3], packet[3:10], packet[10:-1], packet[-1:]))
+
+    assert await t.recv() == data
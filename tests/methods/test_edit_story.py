@@ -0,0 +1,83 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import pytest
+
+from pyrogram import Client, raw
+
+
+class Sent(Exception):
+    pass
+
+
+def flags(query: raw.functions.stories.EditStory) -> int:
+    # Serialized as constructor id, flags, ...
+    return int.from_bytes(query.write()[4:8], "little")
+
+
+async def edit_story(**kwargs) -> raw.functions.stories.EditStory:
+    async def resolve_peer(peer_id):
+        if peer_id == "me":
+            return raw.types.InputPeerSelf()
+
+        return raw.types.InputUser(user_id=peer_id, access_hash=0)
+
+    client = Client("test", in_memory=True)
+    sent = []
+
+    async def invoke(query):
+        sent.append(query)
+        raise Sent
+
+    with mock.patch.object(client, "resolve_peer", resolve_peer), mock.patch.object(client, "invoke", invoke):
+        with pytest.raises(Sent):
+            await client.edit_story(story_id=1, **kwargs)
+
+    return sent[0]
+
+
+@pytest.mark.asyncio
+async def test_edit_story_caption_only():
+    r = await edit_story(caption="hello **world**")
+
+    assert r.caption == "hello world"
+    assert r.entities == [raw.types.MessageEntityBold(offset=6, length=5)]
+    assert r.privacy_rules is None
+    assert r.media_areas is None
+    assert r.media is None
+
+    assert flags(r) == 1 << 1
+
+
+@pytest.mark.asyncio
+async def test_edit_story_allowed_users_only():
+    r = await edit_story(allowed_users=[123, 456])
+
+    assert r.privacy_rules == [
+        raw.types.InputPrivacyValueAllowUsers(users=[
+            raw.types.InputUser(user_id=123, access_hash=0),
+            raw.types.InputUser(user_id=456, access_hash=0)
+        ])
+    ]
+    assert r.caption is None
+    assert r.media_areas is None
+
+    assert flags(r) == 1 << 2
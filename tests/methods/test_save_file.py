@@ -0,0 +1,182 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import io
+from unittest import mock
+
+import pytest
+
+from pyrogram import Client, raw
+from pyrogram.errors import FilePartInvalid
+from pyrogram.methods.advanced import save_file
+
+PART_SIZE = 512 * 1024
+
+
+class Session:
+    instances = []
+    fail_part = None
+    error = None
+
+    def __init__(self, *args, **kwargs):
+        self.parts = []
+        self.is_stopped = False
+
+        Session.instances.append(self)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        self.is_stopped = True
+
+    async def invoke(self, query):
+        if query.file_part == self.fail_part:
+            raise self.error
+
+        self.parts.append(query.file_part)
+
+
+async def client() -> Client:
+    c = Client("test", in_memory=True)
+    c.me = mock.Mock(is_premium=False)
+
+    await c.storage.open()
+    await c.storage.dc_id(2)
+    await c.storage.auth_key(bytes(256))
+    await c.storage.test_mode(False)
+
+    return c
+
+
+async def upload(c: Client, parts: int, **kwargs):
+    with mock.patch.object(save_file, "Session", Session):
+        return await c.save_file(io.BytesIO(bytes(parts * PART_SIZE)), **kwargs)
+
+
+def slots_free(c: Client) -> bool:
+    return c.upload_slots.qsize() == c.max_concurrent_transmissions
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    yield
+    Session.instances.clear()
+    Session.fail_part = None
+    Session.error = None
+
+
+@pytest.mark.asyncio
+async def test_small_file_uploads_all_parts():
+    c = await client()
+    r = await upload(c, 6)
+
+    assert isinstance(r, raw.types.InputFile)
+    assert r.parts == 6
+    assert sorted(c.upload_sessions[0].parts) == list(range(6))
+    assert slots_free(c)
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused():
+    c = await client()
+    await upload(c, 1)
+    session = c.upload_sessions[0]
+    await upload(c, 1)
+
+    assert c.upload_sessions[0] is session
+    assert session.parts == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_stopped():
+    c = await client()
+    c.UPLOAD_SESSION_IDLE_TIMEOUT = 0
+    await upload(c, 1)
+    await asyncio.sleep(0.01)
+
+    assert Session.instances[0].is_stopped
+    assert c.upload_sessions == {}
+    assert c.upload_sessions_idle_tasks == {}
+
+    await upload(c, 1)
+
+    assert len(Session.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_keeps_idle_session_open():
+    c = await client()
+    c.UPLOAD_SESSION_IDLE_TIMEOUT = 0.05
+    await upload(c, 1)
+    idle_task = c.upload_sessions_idle_tasks[0]
+    await upload(c, 1)
+    await asyncio.sleep(0.01)
+
+    assert idle_task.cancelled()
+    assert len(Session.instances) == 1
+    assert not Session.instances[0].is_stopped
+
+    await asyncio.sleep(0.1)
+
+    assert Session.instances[0].is_stopped
+
+
+@pytest.mark.asyncio
+async def test_refused_part_raises():
+    Session.fail_part, Session.error = 3, FilePartInvalid()
+
+    c = await client()
+
+    with pytest.raises(FilePartInvalid):
+        await upload(c, 30)
+
+    session = c.upload_sessions[0]
+
+    assert 3 not in session.parts
+    assert len(session.parts) < 29
+    assert not session.is_stopped
+    assert slots_free(c)
+
+
+@pytest.mark.asyncio
+async def test_connection_error_leaves_part_missing():
+    Session.fail_part, Session.error = 3, OSError()
+
+    c = await client()
+    r = await upload(c, 6)
+    session = Session.instances[0]
+
+    # The file is still returned, the send methods re-upload the part on FilePartMissing
+    assert isinstance(r, raw.types.InputFile)
+    assert sorted(session.parts) == [0, 1, 2, 4, 5]
+    assert session.is_stopped
+    assert c.upload_sessions == {}
+    assert slots_free(c)
+
+
+@pytest.mark.asyncio
+async def test_missing_part():
+    c = await client()
+    r = await upload(c, 6, file_id=1, file_part=4)
+
+    assert r is None
+    assert c.upload_sessions[0].parts == [4]
+    assert slots_free(c)
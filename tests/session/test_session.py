@@ -0,0 +1,55 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.raw.core import Message
+from pyrogram.session import Session, session
+from pyrogram.session.internals import MsgId
+
+
+async def handle_update(is_media: bool) -> mock.AsyncMock:
+    client = mock.Mock(handle_updates=mock.AsyncMock())
+    s = Session(client, 2, bytes(256), False, is_media=is_media)
+    update = Message(body=raw.types.UpdatesTooLong(), msg_id=MsgId(), seq_no=0, length=0)
+
+    with mock.patch.object(session.mtproto, "unpack", return_value=update):
+        await s.handle_packet(b"")
+
+    await asyncio.sleep(0)
+
+    return client.handle_updates
+
+
+@pytest.mark.asyncio
+async def test_main_session_dispatches_updates():
+    handle_updates = await handle_update(is_media=False)
+
+    handle_updates.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_media_session_ignores_updates():
+    handle_updates = await handle_update(is_media=True)
+
+    handle_updates.assert_not_called()
@@ -0,0 +1,205 @@
+#  Pyrofork - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#  Copyright (C) 2022-present Mayuri-Chan <https://github.com/Mayuri-Chan>
+#
+#  This file is part of Pyrofork.
+#
+#  Pyrofork is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrofork is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrofork.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+from io import BytesIO
+from unittest import mock
+
+import pytest
+
+import pyrogram
+from pyrogram import enums, raw, types
+from pyrogram.raw.core import TLObject
+from tests.types import Client
+
+
+def story(caption: str = None) -> types.Story:
+    return types.Story(
+        client=Client(),
+        id=1,
+        date=datetime(2024, 1, 1),
+        expire_date=datetime(2024, 1, 2),
+        media=enums.MessageMediaType.PHOTO,
+        caption=caption
+    )
+
+
+@pytest.mark.asyncio
+async def test_edit_caption_unchanged():
+    s = story("hello world")
+
+    assert await s.edit_caption("hello world") is s
+    assert s._client.edited_stories == []
+
+
+@pytest.mark.asyncio
+async def test_edit_caption_unchanged_after_parsing():
+    s = story("fish & chips")
+
+    assert await s.edit_caption("fish &amp; chips", parse_mode=enums.ParseMode.HTML) is s
+    assert s._client.edited_stories == []
+
+
+@pytest.mark.asyncio
+async def test_edit_caption_changed():
+    s = story("hello world")
+
+    await s.edit_caption("hello there")
+
+    assert s._client.edited_stories == [{
+        "chat_id": None,
+        "story_id": 1,
+        "caption": "hello there",
+        "parse_mode": enums.ParseMode.DISABLED,
+        "caption_entities": None
+    }]
+
+
+@pytest.mark.asyncio
+async def test_edit_caption_formatted():
+    s = story("hello world")
+
+    await s.edit_caption("hello **world**")
+
+    assert s._client.edited_stories == [{
+        "chat_id": None,
+        "story_id": 1,
+        "caption": "hello **world**",
+        "parse_mode": None,
+        "caption_entities": None
+    }]
+
+
+def roundtrip(obj: TLObject) -> TLObject:
+    # Parse what would come off the wire, with the defaults the generated readers fill in
+    return TLObject.read(BytesIO(obj.write()))
+
+
+raw_user = roundtrip(raw.types.User(id=1, access_hash=0, first_name="User"))
+raw_channel = roundtrip(raw.types.Channel(id=2, access_hash=0, title="Channel", photo=raw.types.ChatPhotoEmpty(), date=0))
+
+
+def story_item(**kwargs) -> raw.types.StoryItem:
+    return roundtrip(raw.types.StoryItem(id=1, date=1, expire_date=2, media=raw.types.MessageMediaUnsupported(), **kwargs))
+
+
+def client() -> pyrogram.Client:
+    c = pyrogram.Client("test", in_memory=True)
+    c.get_users = mock.AsyncMock(return_value=types.User(id=1))
+    c.resolve_peer = mock.AsyncMock(return_value=raw.types.InputChannel(channel_id=2, access_hash=0))
+    c.invoke = mock.AsyncMock(return_value=raw.types.messages.Chats(chats=[raw_channel]))
+
+    return c
+
+
+@pytest.mark.asyncio
+async def test_parse_user_peer_from_map():
+    c = client()
+    s = await types.Story._parse(c, story_item(), raw.types.PeerUser(user_id=1), {1: raw_user}, {})
+
+    assert s.from_user.id == 1
+    assert s.from_user.first_name == "User"
+    c.get_users.assert_not_called()
+    c.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_user_peer_fallback():
+    c = client()
+    s = await types.Story._parse(c, story_item(), raw.types.PeerUser(user_id=1), {}, {})
+
+    assert s.from_user.id == 1
+    c.get_users.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_parse_channel_peer_from_map():
+    c = client()
+    s = await types.Story._parse(c, story_item(), raw.types.PeerChannel(channel_id=2), {}, {2: raw_channel})
+
+    assert s.sender_chat.id == -1000000000002
+    assert s.sender_chat.title == "Channel"
+    c.invoke.assert_not_called()
+    c.resolve_peer.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_channel_peer_fallback():
+    c = client()
+    s = await types.Story._parse(c, story_item(), raw.types.PeerChannel(channel_id=2), {}, {})
+
+    assert s.sender_chat.id == -1000000000002
+    c.resolve_peer.assert_awaited_once_with(-1000000000002)
+    assert isinstance(c.invoke.await_args.args[0], raw.functions.channels.GetChannels)
+
+
+@pytest.mark.asyncio
+async def test_parse_channel_peer_user_sender_from_map():
+    c = client()
+    s = await types.Story._parse(
+        c,
+        story_item(from_id=raw.types.PeerUser(user_id=1)),
+        raw.types.PeerChannel(channel_id=2),
+        {1: raw_user},
+        {2: raw_channel}
+    )
+
+    assert s.from_user.id == 1
+    assert s.chat.id == -1000000000002
+    c.get_users.assert_not_called()
+    c.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_deleted_channel_peer_from_map():
+    c = client()
+    item = roundtrip(raw.types.StoryItemDeleted(id=1))
+
+    s = await types.Story._parse(c, item, raw.types.PeerChannel(channel_id=2), {}, {2: raw_channel})
+
+    assert isinstance(s, types.StoryDeleted)
+    assert s.sender_chat.title == "Channel"
+    c.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_deleted_channel_peer_fallback():
+    c = client()
+    item = roundtrip(raw.types.StoryItemDeleted(id=1))
+
+    s = await types.Story._parse(c, item, raw.types.PeerChannel(channel_id=2), {}, {})
+
+    assert isinstance(s, types.StoryDeleted)
+    assert s.sender_chat.id == -1000000000002
+    assert isinstance(c.invoke.await_args.args[0], raw.functions.channels.GetChannels)
+
+
+@pytest.mark.asyncio
+async def test_parse_skipped_user_peer():
+    c = client()
+    item = roundtrip(raw.types.StoryItemSkipped(id=1, date=1, expire_date=2))
+
+    s = await types.Story._parse(c, item, raw.types.PeerUser(user_id=1), {1: raw_user}, {})
+    assert isinstance(s, types.StorySkipped)
+    assert s.from_user.first_name == "User"
+    c.get_users.assert_not_called()
+
+    s = await types.Story._parse(c, item, raw.types.PeerUser(user_id=1), {}, {})
+    assert s.from_user.id == 1
+    c.get_users.assert_awaited_once_with(1)